@@ -7,6 +7,7 @@ to enable accurate merging of data from multiple sources.
 """
 
 import os
+from functools import lru_cache
 import pandas as pd
 import pycountry
 
@@ -40,7 +41,14 @@ COUNTRY_MAPPING = {
     # Add more mappings as needed
 }
 
+# Index pycountry names once so lookups don't scan every country
+_NAME_INDEX = {c.name.lower(): c.name for c in pycountry.countries}
+_COMMON_NAME_INDEX = {
+    c.common_name: c.name for c in pycountry.countries if hasattr(c, 'common_name')
+}
+
 
+@lru_cache(maxsize=None)
 def standardize_country(country):
     """
     Standardize a country name to its official name.
@@ -58,37 +66,27 @@ def standardize_country(country):
     if country in COUNTRY_MAPPING:
         return COUNTRY_MAPPING[country]
     
-    # Try to find the country in pycountry
-    try:
-        # Search by name
-        country_obj = pycountry.countries.get(name=country)
-        if country_obj:
-            return country_obj.name
-        
-        # Search by common name (alternative)
-        for c in pycountry.countries:
-            if hasattr(c, 'common_name') and c.common_name == country:
-                return c.name
-    except:
-        # If unable to standardize, return the original name
-        pass
+    # Search pycountry by official name (case-insensitive), then by common name
+    if country.lower() in _NAME_INDEX:
+        return _NAME_INDEX[country.lower()]
     
-    return country
+    # If unable to standardize, return the original name
+    return _COMMON_NAME_INDEX.get(country, country)
 
 
 def standardize_countries_in_file(input_file, output_file, country_column='country'):
     """
-    Standardize country names in a CSV file.
+    Standardize country names in a CSV file and save the result as Parquet.
     
     Args:
         input_file (str): Path to input CSV file
-        output_file (str): Path to output CSV file
+        output_file (str): Path to output Parquet file
         country_column (str): Name of the column containing country names
     """
     print(f"Standardizing country names in {input_file}...")
     
-    # Load the CSV file
-    df = pd.read_csv(input_file)
+    # Load the CSV file, reading country names as strings without type inference
+    df = pd.read_csv(input_file, dtype={country_column: str})
     
     # Check if the country column exists
     if country_column not in df.columns:
@@ -99,15 +97,17 @@ def standardize_countries_in_file(input_file, output_file, country_column='count
     countries_before = sorted(df[country_column].unique())
     print(f"Found {len(countries_before)} unique countries before standardization.")
     
-    # Apply the standardize_country function to the country column
-    df[country_column] = df[country_column].apply(standardize_country)
+    # Standardize each distinct country once, then map the results onto the column
+    countries = df[country_column].astype(str)
+    lookup = {country: standardize_country(country) for country in countries.unique()}
+    df[country_column] = countries.map(lookup)
     
     # Get the unique countries after standardization
     countries_after = sorted(df[country_column].unique())
     print(f"Found {len(countries_after)} unique countries after standardization.")
     
     # Save the standardized DataFrame
-    df.to_csv(output_file, index=False)
+    df.to_parquet(output_file, index=False, engine='pyarrow', compression='zstd')
     print(f"Standardized data saved to {output_file}")
 
 
@@ -119,10 +119,10 @@ def main():
     
     # Define input and output files
     source1_input = os.path.join(data_dir, "surf_breaks_complete.csv")
-    source1_output = os.path.join(data_dir, "surf_breaks_complete_standardized.csv")
+    source1_output = os.path.join(data_dir, "surf_breaks_complete_standardized.parquet")
     
     source2_input = os.path.join(data_dir, "additional_source_complete.csv")
-    source2_output = os.path.join(data_dir, "additional_source_complete_standardized.csv")
+    source2_output = os.path.join(data_dir, "additional_source_complete_standardized.parquet")
     
     # Check if input files exist
     if not os.path.exists(source1_input):
@@ -9,6 +9,21 @@ and surf break names, creating a comprehensive dataset of surf spots.
 import os
 import string
 import pandas as pd
+import pyarrow as pa
+import pyarrow.csv as pacsv
+import pyarrow.parquet as pq
+from pandas.api.types import union_categoricals
+
+
+# Translation table that strips punctuation from surf break names
+_PUNCT_TABLE = str.maketrans('', '', string.punctuation)
+
+# Priority of each kind of match, from source1 key type to source2 key type
+MATCH_RANKS = {
+    'name_name': 0,
+    'name_alt': 1,
+    'alt_name': 2,
+}
 
 
 def clean_name(name):
@@ -21,11 +36,72 @@ def clean_name(name):
     Returns:
         str: Cleaned surf break name
     """
-    # Create a translation table to remove punctuation
-    trans = str.maketrans('', '', string.punctuation)
-    
     # Clean the name by removing punctuation, spaces, and converting to lowercase
-    return str(name).translate(trans).replace(' ', '').lower()
+    return str(name).translate(_PUNCT_TABLE).replace(' ', '').lower()
+
+
+def clean_name_series(names):
+    """
+    Clean a Series of surf break names for comparison.
+    
+    Vectorized equivalent of applying clean_name to every element.
+    
+    Args:
+        names (pd.Series): Surf break names to clean
+        
+    Returns:
+        pd.Series: Cleaned surf break names
+    """
+    return (
+        names.astype(str)
+        .str.translate(_PUNCT_TABLE)
+        .str.replace(' ', '', regex=False)
+        .str.lower()
+    )
+
+
+def build_match_keys(df):
+    """
+    Stack clean names and clean alternative names into a single match key column.
+    
+    Args:
+        df (pd.DataFrame): Source data with clean_name and clean_alt_name columns
+        
+    Returns:
+        pd.DataFrame: One row per entry and distinct key, with the entry's position
+        in entry_id and the kind of key ('name' or 'alt') in match_type
+    """
+    df = df.assign(entry_id=range(len(df)))
+    keys = pd.concat([
+        df.assign(match_key=df['clean_name'], match_type='name'),
+        df.assign(match_key=df['clean_alt_name'], match_type='alt'),
+    ], ignore_index=True)
+    
+    # An alternative name that cleans to the name itself adds nothing
+    return keys.drop_duplicates(subset=['entry_id', 'match_key'])
+
+
+def find_unmatched(df, matched, on):
+    """
+    Find the rows of a DataFrame whose key does not appear in another (left anti-join).
+    
+    Args:
+        df (pd.DataFrame): DataFrame to filter
+        matched (pd.DataFrame): DataFrame containing the matched keys
+        on (str): Key column present in both DataFrames
+        
+    Returns:
+        pd.DataFrame: Rows of df with no matching key
+    """
+    flagged = pd.merge(
+        df,
+        matched[[on]].drop_duplicates(),
+        on=on,
+        how='left',
+        indicator=True,
+        validate='many_to_one'
+    )
+    return flagged[flagged['_merge'] == 'left_only'].drop(columns=['_merge'])
 
 
 def merge_datasets(source1_path, source2_path, output_path):
@@ -33,128 +109,135 @@ def merge_datasets(source1_path, source2_path, output_path):
     Merge two surf break datasets.
     
     Args:
-        source1_path (str): Path to first source CSV
-        source2_path (str): Path to second source CSV
+        source1_path (str): Path to first source Parquet file
+        source2_path (str): Path to second source Parquet file
         output_path (str): Path to output merged CSV
+        
+    Returns:
+        tuple: (merge_stats, source1_unmatched, source2_unmatched) where merge_stats
+        is a dict of match counts and the unmatched DataFrames hold the entries of
+        each source that were not merged
     """
     print(f"Merging datasets from {source1_path} and {source2_path}...")
     
-    # Load the CSV files
-    source1 = pd.read_csv(source1_path)
-    source2 = pd.read_csv(source2_path)
+    # Load the standardized sources
+    source1 = pd.read_parquet(source1_path)
+    source2 = pd.read_parquet(source2_path)
+    source1_columns = list(source1.columns)
+    source2_columns = list(source2.columns)
+    
+    # Share one set of country categories so the join compares integer codes
+    countries = union_categoricals([
+        source1['country'].astype('category'),
+        source2['country'].astype('category')
+    ])
+    source1['country'] = pd.Categorical(source1['country'], categories=countries.categories)
+    source2['country'] = pd.Categorical(source2['country'], categories=countries.categories)
     
     # Make a copy of the name column for source1 as 'Alternative name'
     source1['Alternative name'] = source1['name']
     
     # Clean names for matching
-    source1['clean_name'] = source1['name'].apply(clean_name)
-    source2['clean_name'] = source2['name'].apply(clean_name)
+    source1['clean_name'] = clean_name_series(source1['name'])
+    source1['clean_alt_name'] = source1['clean_name']
+    source2['clean_name'] = clean_name_series(source2['name'])
     
     # Clean alternative names if they exist in source2
     if 'Alternative name' in source2.columns:
-        source2['clean_alt_name'] = source2['Alternative name'].apply(clean_name)
+        source2['clean_alt_name'] = clean_name_series(source2['Alternative name'])
     else:
         source2['Alternative name'] = source2['name']
         source2['clean_alt_name'] = source2['clean_name']
     
-    # Merge datasets based on clean name and country
-    print("Performing initial merge on clean name and country...")
-    merged_df = pd.merge(
-        source1, 
-        source2,
-        on=['clean_name', 'country'], 
+    # Match names and alternative names in a single join on match key and country
+    print("Matching on clean names, alternative names and country...")
+    candidates = pd.merge(
+        build_match_keys(source1),
+        build_match_keys(source2),
+        on=['match_key', 'country'],
         how='inner',
-        suffixes=('_source1', '_source2')
+        suffixes=('_source1', '_source2'),
+        validate='many_to_many'
     )
     
-    # Handle remaining entries - check for matches between name and alternative name
-    source1_leftover = source1[~source1['clean_name'].isin(merged_df['clean_name'])]
-    source2_leftover = source2[~source2['clean_name'].isin(merged_df['clean_name'])]
+    # Rank each candidate by the kind of match (alternative-to-alternative is not a match)
+    match_kinds = candidates['match_type_source1'] + '_' + candidates['match_type_source2']
+    candidates['match_rank'] = match_kinds.map(MATCH_RANKS)
+    candidates = candidates.dropna(subset=['match_rank']).sort_values('match_rank', kind='stable')
     
-    print(f"Found {len(merged_df)} direct matches. Processing remaining entries...")
-    print(f"Source 1 leftovers: {len(source1_leftover)}")
-    print(f"Source 2 leftovers: {len(source2_leftover)}")
+    # Keep the best match for each pair of entries
+    candidates = candidates.drop_duplicates(subset=['entry_id_source1', 'entry_id_source2'])
     
-    # Try matching source1 names with source2 alternative names
-    name_alt_matches = pd.merge(
-        source1_leftover,
-        source2_leftover,
-        left_on=['clean_name', 'country'],
-        right_on=['clean_alt_name', 'country'],
-        how='inner',
-        suffixes=('_source1', '_source2')
+    # Entries with a direct match are not matched again on their alternative names
+    direct = candidates['match_rank'] == MATCH_RANKS['name_name']
+    rematched = (
+        candidates['entry_id_source1'].isin(candidates.loc[direct, 'entry_id_source1'])
+        | candidates['entry_id_source2'].isin(candidates.loc[direct, 'entry_id_source2'])
     )
+    all_matches = candidates[direct | ~rematched].reset_index(drop=True)
     
-    # Try matching source1 alternative names with source2 names
-    alt_name_matches = pd.merge(
-        source1_leftover,
-        source2_leftover,
-        left_on=['clean_alt_name', 'country'],
-        right_on=['clean_name', 'country'],
-        how='inner',
-        suffixes=('_source1', '_source2')
-    )
+    match_counts = all_matches['match_rank'].value_counts()
+    direct_matches = int(match_counts.get(MATCH_RANKS['name_name'], 0))
+    name_alt_matches = int(match_counts.get(MATCH_RANKS['name_alt'], 0))
+    alt_name_matches = int(match_counts.get(MATCH_RANKS['alt_name'], 0))
     
-    print(f"Found {len(name_alt_matches)} name-to-alternative matches.")
-    print(f"Found {len(alt_name_matches)} alternative-to-name matches.")
+    print(f"Found {direct_matches} direct matches.")
+    print(f"Found {name_alt_matches} name-to-alternative matches.")
+    print(f"Found {alt_name_matches} alternative-to-name matches.")
     
-    # Combine all matches
-    all_matches = pd.concat([merged_df, name_alt_matches, alt_name_matches], ignore_index=True)
+    # Find entries of each source that were not matched
+    source1_unmatched = find_unmatched(
+        source1.assign(entry_id=range(len(source1))),
+        all_matches.rename(columns={'entry_id_source1': 'entry_id'}),
+        on='entry_id'
+    )[source1_columns]
+    source2_unmatched = find_unmatched(
+        source2.assign(entry_id=range(len(source2))),
+        all_matches.rename(columns={'entry_id_source2': 'entry_id'}),
+        on='entry_id'
+    )[source2_columns]
     
     # Drop temporary columns used for matching
-    columns_to_drop = ['clean_name', 'clean_alt_name']
-    all_matches = all_matches.drop(columns=[col for col in columns_to_drop if col in all_matches.columns])
+    columns_to_drop = ['match_key', 'match_rank'] + [
+        f"{col}{suffix}"
+        for col in ['clean_name', 'clean_alt_name', 'match_type', 'entry_id']
+        for suffix in ('_source1', '_source2')
+    ]
+    all_matches = all_matches.drop(columns=columns_to_drop)
     
     # Save the merged dataset
-    all_matches.to_csv(output_path, index=False)
+    pacsv.write_csv(pa.Table.from_pandas(all_matches, preserve_index=False), output_path)
     print(f"Merged data saved to {output_path}")
     print(f"Total entries in merged dataset: {len(all_matches)}")
     
-    # Calculate and return statistics about the merge
-    return {
+    # Calculate statistics about the merge
+    merge_stats = {
         'total_merged': len(all_matches),
-        'direct_matches': len(merged_df),
-        'name_alt_matches': len(name_alt_matches),
-        'alt_name_matches': len(alt_name_matches),
-        'source1_unmatched': len(source1) - len(all_matches),
-        'source2_unmatched': len(source2) - len(all_matches)
+        'direct_matches': direct_matches,
+        'name_alt_matches': name_alt_matches,
+        'alt_name_matches': alt_name_matches,
+        'source1_unmatched': len(source1_unmatched),
+        'source2_unmatched': len(source2_unmatched)
     }
+    
+    return merge_stats, source1_unmatched, source2_unmatched
 
 
-def create_unmatched_datasets(source1_path, source2_path, merged_path, output_dir):
+def create_unmatched_datasets(source1_unmatched, source2_unmatched, output_dir):
     """
-    Create datasets of unmatched entries for further analysis.
+    Save datasets of unmatched entries for further analysis.
     
     Args:
-        source1_path (str): Path to first source CSV
-        source2_path (str): Path to second source CSV
-        merged_path (str): Path to merged CSV
+        source1_unmatched (pd.DataFrame): Unmatched entries from the first source
+        source2_unmatched (pd.DataFrame): Unmatched entries from the second source
         output_dir (str): Directory to save unmatched datasets
     """
-    # Load datasets
-    source1 = pd.read_csv(source1_path)
-    source2 = pd.read_csv(source2_path)
-    merged = pd.read_csv(merged_path)
-    
-    # Clean names for matching
-    source1['clean_name'] = source1['name'].apply(clean_name)
-    source2['clean_name'] = source2['name'].apply(clean_name)
-    merged['clean_name'] = merged['name_source1'].apply(clean_name)
-    
-    # Find unmatched entries
-    source1_unmatched = source1[~source1['clean_name'].isin(merged['clean_name'])]
-    source2_unmatched = source2[~source2['clean_name'].isin(merged['clean_name'])]
-    
-    # Drop temporary columns
-    source1_unmatched = source1_unmatched.drop(columns=['clean_name'])
-    source2_unmatched = source2_unmatched.drop(columns=['clean_name'])
-    
     # Save unmatched datasets
     source1_unmatched_path = os.path.join(output_dir, "source1_unmatched.csv")
     source2_unmatched_path = os.path.join(output_dir, "source2_unmatched.csv")
     
-    source1_unmatched.to_csv(source1_unmatched_path, index=False)
-    source2_unmatched.to_csv(source2_unmatched_path, index=False)
+    pacsv.write_csv(pa.Table.from_pandas(source1_unmatched, preserve_index=False), source1_unmatched_path)
+    pacsv.write_csv(pa.Table.from_pandas(source2_unmatched, preserve_index=False), source2_unmatched_path)
     
     print(f"Source 1 unmatched entries saved to {source1_unmatched_path}")
     print(f"Source 2 unmatched entries saved to {source2_unmatched_path}")
@@ -167,8 +250,8 @@ def main():
     os.makedirs(data_dir, exist_ok=True)
     
     # Define input and output files
-    source1_path = os.path.join(data_dir, "surf_breaks_complete_standardized.csv")
-    source2_path = os.path.join(data_dir, "additional_source_complete_standardized.csv")
+    source1_path = os.path.join(data_dir, "surf_breaks_complete_standardized.parquet")
+    source2_path = os.path.join(data_dir, "additional_source_complete_standardized.parquet")
     merged_path = os.path.join(data_dir, "merged_surf_breaks.csv")
     
     # Check if input files exist
@@ -181,13 +264,14 @@ def main():
         print(f"Second source file {source2_path} not found!")
         print("Using only the first source data.")
         # Copy source1 to merged_path
-        source1 = pd.read_csv(source1_path)
-        source1.to_csv(merged_path, index=False)
+        pacsv.write_csv(pq.read_table(source1_path), merged_path)
         print(f"Single source data saved to {merged_path}")
         return
     
     # Merge the datasets
-    merge_stats = merge_datasets(source1_path, source2_path, merged_path)
+    merge_stats, source1_unmatched, source2_unmatched = merge_datasets(
+        source1_path, source2_path, merged_path
+    )
     
     # Print merge statistics
     print("\nMerge Statistics:")
@@ -195,7 +279,7 @@ def main():
         print(f"  {key}: {value}")
     
     # Create datasets of unmatched entries
-    create_unmatched_datasets(source1_path, source2_path, merged_path, data_dir)
+    create_unmatched_datasets(source1_unmatched, source2_unmatched, data_dir)
 
 
 if __name__ == "__main__":
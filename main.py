@@ -10,9 +10,13 @@ import os
 import argparse
 from datetime import datetime
 
+import pandas as pd
+import pyarrow.csv as pacsv
+import pyarrow.parquet as pq
+
 # Import components
 from scraper.break_list_scraper import scrape_surf_breaks, save_data as save_break_list
-from scraper.break_detail_scraper import scrape_break_details, save_data as save_break_details
+from scraper.break_detail_scraper import scrape_break_details, clear_checkpoint, save_data as save_break_details
 from data_processing.country_standardizer import standardize_countries_in_file
 from data_processing.data_merger import merge_datasets, create_unmatched_datasets
 from utils.cleaning_utils import create_directories
@@ -43,9 +47,10 @@ def run_pipeline(scrape_breaks=True, scrape_details=True, standardize=True, merg
     data_dir = "data"
     breaks_list_path = os.path.join(data_dir, "surf_breaks_list.csv")
     breaks_complete_path = os.path.join(data_dir, "surf_breaks_complete.csv")
-    breaks_standardized_path = os.path.join(data_dir, "surf_breaks_complete_standardized.csv")
+    breaks_checkpoint_dir = os.path.join(data_dir, "surf_breaks_complete_checkpoint")
+    breaks_standardized_path = os.path.join(data_dir, "surf_breaks_complete_standardized.parquet")
     
-    second_source_standardized_path = os.path.join(data_dir, "additional_source_complete_standardized.csv")
+    second_source_standardized_path = os.path.join(data_dir, "additional_source_complete_standardized.parquet")
     merged_path = os.path.join(data_dir, "merged_surf_breaks.csv")
     
     # Start pipeline
@@ -67,8 +72,11 @@ def run_pipeline(scrape_breaks=True, scrape_details=True, standardize=True, merg
             print(f"Error: Breaks list file '{breaks_list_path}' not found!")
             return
         
-        breaks_df = scrape_break_details(pd.read_csv(breaks_list_path))
+        breaks_df = scrape_break_details(pd.read_csv(breaks_list_path), checkpoint_dir=breaks_checkpoint_dir)
         save_break_details(breaks_df, output_dir=data_dir, filename="surf_breaks_complete.csv")
+        
+        # The details are saved, so the checkpoint is no longer needed
+        clear_checkpoint(breaks_checkpoint_dir)
     else:
         print("\n=== Step 2: Skipping scraping of break details ===")
     
@@ -98,7 +106,9 @@ def run_pipeline(scrape_breaks=True, scrape_details=True, standardize=True, merg
         
         if second_source and os.path.exists(second_source_standardized_path):
             print("Merging with second source data...")
-            merge_stats = merge_datasets(breaks_standardized_path, second_source_standardized_path, merged_path)
+            merge_stats, source1_unmatched, source2_unmatched = merge_datasets(
+                breaks_standardized_path, second_source_standardized_path, merged_path
+            )
             
             # Print merge statistics
             print("\nMerge Statistics:")
@@ -106,12 +116,11 @@ def run_pipeline(scrape_breaks=True, scrape_details=True, standardize=True, merg
                 print(f"  {key}: {value}")
             
             # Create datasets of unmatched entries
-            create_unmatched_datasets(breaks_standardized_path, second_source_standardized_path, merged_path, data_dir)
+            create_unmatched_datasets(source1_unmatched, source2_unmatched, data_dir)
         else:
             print("No second source data found. Using only the primary source.")
-            # Copy breaks_standardized to merged_path
-            import shutil
-            shutil.copy(breaks_standardized_path, merged_path)
+            # Write breaks_standardized to merged_path
+            pacsv.write_csv(pq.read_table(breaks_standardized_path), merged_path)
     else:
         print("\n=== Step 4: Skipping dataset merging ===")
     
@@ -7,164 +7,305 @@ using the links collected by the break_list_scraper.
 """
 
 import os
+from concurrent.futures import ThreadPoolExecutor
+from functools import partial
 import requests
-from bs4 import BeautifulSoup
+from bs4 import BeautifulSoup, SoupStrainer
 import pandas as pd
+import pyarrow as pa
+import pyarrow.csv as pacsv
+import pyarrow.parquet as pq
 from tqdm import tqdm
 
+# Import the shared session whether run as a script or as part of the package
+try:
+    from scraper.session import SESSION
+except ImportError:
+    from session import SESSION
 
-def scrape_break_details(breaks_df, base_domain="PLACEHOLDER_DOMAIN"):
+
+# Columns added to the breaks list by the detail scraper
+DETAIL_COLUMNS = [
+    'region', 'type', 'rating', 'reliability', 'swell_direction', 'wind_direction',
+    'best_month', 'best_season', 'summary', 'time_of_year'
+]
+
+# Columns written to the checkpoint part files while scraping
+CHECKPOINT_SCHEMA = pa.schema(
+    [(col, pa.string()) for col in ['name', 'link', 'country'] + DETAIL_COLUMNS]
+)
+
+# CSS selectors for the elements read from each break page
+REGION_OPTION_SELECTOR = 'select#region_id option[selected]'
+COUNTRY_OPTION_SELECTOR = 'select#country_id option[selected]'
+INFO_TABLE_SELECTOR = 'table.guide-header__information'
+TYPE_ICON_SELECTOR = 'img.guide-header__type-icon.guide-header__type-icon--break'
+RATING_SELECTOR = 'img.guide-header__type-icon.guide-header__type-icon--stars ~ span'
+BEST_SURF_SELECTOR = 'div.guide-header__best-surf p'
+DIRECTION_SELECTOR = 'span.guide-header__dir'
+BEST_MONTH_SELECTOR = 'div.guide-page__best-month'
+SUMMARY_SELECTOR = 'div.guide-header__summary__text'
+TIME_OF_YEAR_SELECTOR = 'div.guide-page__text'
+
+# Only the tags read by the extract_* helpers (plus their contents) are parsed
+DETAIL_STRAINER = SoupStrainer(['select', 'table', 'div'])
+
+
+def scrape_break_details(breaks_df, base_domain="PLACEHOLDER_DOMAIN", max_workers=16,
+                         checkpoint_dir=None, batch_size=500):
     """
     Scrape detailed information for each surf break.
     
+    With a checkpoint directory, scraped breaks are written to it in batches, and
+    a rerun after a crash only fetches the breaks that are not in it yet. Call
+    clear_checkpoint once the returned data has been saved.
+    
     Args:
         breaks_df (pd.DataFrame): DataFrame containing break names, links, and countries
         base_domain (str): Base domain for surf forecast website
+        max_workers (int): Number of breaks to fetch concurrently
+        checkpoint_dir (str): Directory of Parquet part files to resume from
+            and write scraped breaks to (optional)
+        batch_size (int): Number of breaks per checkpoint part file
         
     Returns:
         pd.DataFrame: DataFrame with detailed break information
     """
-    # Create a copy of the input DataFrame
-    df = breaks_df.copy()
+    rows = breaks_df.to_dict('records')
     
-    # Create new columns to store the scraped data
-    df['region'] = ''
-    df['type'] = ''
-    df['rating'] = ''
-    df['reliability'] = ''
-    df['swell_direction'] = ''
-    df['wind_direction'] = ''
-    df['best_month'] = ''
-    df['best_season'] = ''
-    df['summary'] = ''
-    df['time_of_year'] = ''
-
-    # Iterate through each break
+    # Reuse the breaks an earlier run already scraped
+    scraped = load_checkpoint(checkpoint_dir) if checkpoint_dir else {}
+    pending = [row for row in rows if row['link'] not in scraped]
+    if scraped:
+        print(f"Resuming from checkpoint: {len(rows) - len(pending)} breaks already scraped.")
+    
+    if checkpoint_dir:
+        os.makedirs(checkpoint_dir, exist_ok=True)
+    
+    # Fetch the remaining break pages concurrently
     print("Scraping detailed break information...")
-    for index, row in tqdm(df.iterrows(), total=df.shape[0], desc="Processing breaks"):
-        url = f"https://{base_domain}{row['link']}"
-        
-        try:
-            response = requests.get(url)
-            response.raise_for_status()  # Raise an exception for HTTP errors
-            soup = BeautifulSoup(response.text, 'html.parser')
-
-            # Extract region information
-            df.at[index, 'region'] = extract_region(soup)
-            
-            # Extract country information (from the page, not the list)
-            df.at[index, 'country'] = extract_country(soup)
-            
-            # Extract break information from the details table
-            extract_break_info(soup, df, index)
-            
-            # Extract directions, seasonal info, and summary
-            extract_additional_info(soup, df, index)
-            
-        except requests.exceptions.RequestException as e:
-            print(f"Error scraping break {row['name']}: {e}")
-            continue
-        except Exception as e:
-            print(f"Unexpected error processing break {row['name']}: {e}")
-            continue
+    batch = []
+    try:
+        with ThreadPoolExecutor(max_workers=max_workers) as executor:
+            results = executor.map(partial(fetch_break_details, base_domain=base_domain), pending)
+            try:
+                for row, (record, ok) in tqdm(zip(pending, results), total=len(pending), desc="Processing breaks"):
+                    scraped[row['link']] = record
+                    
+                    # Only checkpoint breaks that were scraped, so a rerun after a crash retries the failures
+                    if ok and checkpoint_dir:
+                        batch.append({'name': row['name'], 'link': row['link'], **record})
+                        if len(batch) >= batch_size:
+                            # Start the next batch first so a failed write isn't retried on the way out
+                            full_batch, batch = batch, []
+                            write_checkpoint(checkpoint_dir, full_batch)
+            except BaseException:
+                # Drop the queued pages instead of fetching all of them before the error surfaces
+                executor.shutdown(cancel_futures=True)
+                raise
+    finally:
+        # Flush whatever was scraped, even if scraping stopped early
+        if batch:
+            write_checkpoint(checkpoint_dir, batch)
+    
+    # Build the scraped columns in one go and attach them to the input breaks
+    records = [scraped[row['link']] for row in rows]
+    details_df = pd.DataFrame(records, index=breaks_df.index, columns=['country'] + DETAIL_COLUMNS)
+    df = breaks_df.copy()
+    df[details_df.columns] = details_df
             
     return df
 
 
+def checkpoint_parts(checkpoint_dir):
+    """List the Parquet part files in a checkpoint directory, oldest first"""
+    if not os.path.isdir(checkpoint_dir):
+        return []
+    return sorted(
+        os.path.join(checkpoint_dir, filename)
+        for filename in os.listdir(checkpoint_dir)
+        if filename.startswith('part-') and filename.endswith('.parquet')
+    )
+
+
+def load_checkpoint(checkpoint_dir):
+    """Load the breaks saved in a checkpoint directory, as scraped details keyed by link"""
+    scraped = {}
+    for part_path in checkpoint_parts(checkpoint_dir):
+        for entry in pq.read_table(part_path, schema=CHECKPOINT_SCHEMA).to_pylist():
+            scraped[entry['link']] = {col: entry[col] for col in ['country'] + DETAIL_COLUMNS}
+    return scraped
+
+
+def write_checkpoint(checkpoint_dir, batch):
+    """Write a batch of scraped breaks to a new part file in the checkpoint directory"""
+    part_path = os.path.join(checkpoint_dir, f"part-{len(checkpoint_parts(checkpoint_dir)):05d}.parquet")
+    tmp_path = part_path + '.tmp'
+    
+    # Store missing values (e.g. a break without a name, read as NaN) as nulls
+    batch = [{col: None if pd.isna(value) else str(value) for col, value in entry.items()} for entry in batch]
+    pq.write_table(pa.Table.from_pylist(batch, schema=CHECKPOINT_SCHEMA), tmp_path, compression='zstd')
+    
+    # Move the finished file into place so an interrupted write never leaves a partial part
+    os.replace(tmp_path, part_path)
+
+
+def clear_checkpoint(checkpoint_dir):
+    """Remove the part files written by write_checkpoint, and the directory if that empties it"""
+    if not os.path.isdir(checkpoint_dir):
+        return
+    
+    for filename in os.listdir(checkpoint_dir):
+        if filename.startswith('part-') and filename.endswith(('.parquet', '.parquet.tmp')):
+            os.remove(os.path.join(checkpoint_dir, filename))
+    
+    try:
+        os.rmdir(checkpoint_dir)
+    except OSError:
+        # Other files are still in the directory
+        pass
+
+
+def fetch_break_details(row, base_domain):
+    """
+    Fetch and parse the detail page for a single surf break.
+    
+    Args:
+        row (dict): Break entry with name, link, and country
+        base_domain (str): Base domain for surf forecast website
+        
+    Returns:
+        tuple: (record, ok) where record is a dict of scraped details for the break
+        and ok is False if the page could not be fetched or parsed
+    """
+    url = f"https://{base_domain}{row['link']}"
+    
+    # Default to empty details and keep the listed country if scraping fails
+    record = dict.fromkeys(DETAIL_COLUMNS, '')
+    record['country'] = row['country']
+    ok = False
+    
+    try:
+        response = SESSION.get(url, timeout=10)
+        response.raise_for_status()  # Raise an exception for HTTP errors
+        soup = BeautifulSoup(response.content, 'lxml', parse_only=DETAIL_STRAINER)
+
+        # Extract region information
+        record['region'] = extract_region(soup)
+        
+        # Extract country information (from the page, not the list)
+        record['country'] = extract_country(soup)
+        
+        # Extract break information from the details table
+        record.update(extract_break_info(soup))
+        
+        # Extract directions, seasonal info, and summary
+        record.update(extract_additional_info(soup))
+        ok = True
+        
+    except requests.exceptions.RequestException as e:
+        print(f"Error scraping break {row['name']}: {e}")
+    except Exception as e:
+        print(f"Unexpected error processing break {row['name']}: {e}")
+    
+    return record, ok
+
+
 def extract_region(soup):
     """Extract region information from the page"""
-    try:
-        region_select = soup.find('select', id='region_id')
-        region_option = region_select.find('option', selected=True)
-        return region_option.text if region_option else ''
-    except:
-        return ''
+    region_option = soup.select_one(REGION_OPTION_SELECTOR)
+    return region_option.text if region_option else ''
 
 
 def extract_country(soup):
     """Extract country information from the page"""
-    try:
-        country_select = soup.find('select', id='country_id')
-        country_option = country_select.find('option', selected=True)
-        return country_option.text if country_option else ''
-    except:
-        return ''
+    country_option = soup.select_one(COUNTRY_OPTION_SELECTOR)
+    return country_option.text if country_option else ''
 
 
-def extract_break_info(soup, df, index):
+def extract_break_info(soup):
     """Extract break information from the details table"""
+    info = {'type': '', 'rating': '', 'reliability': ''}
+    
     # Find the table with the guide-header__information class
-    table = soup.find('table', class_='guide-header__information')
+    table = soup.select_one(INFO_TABLE_SELECTOR)
     if not table:
-        return
+        return info
         
     try:
         # Find the type
-        type_img = table.find('img', class_='guide-header__type-icon guide-header__type-icon--break')
+        type_img = table.select_one(TYPE_ICON_SELECTOR)
         if type_img:
-            type_text = type_img.find_next_sibling(text=True)
-            df.at[index, 'type'] = type_text.strip() if type_text else ''
+            type_text = type_img.find_next_sibling(string=True)
+            info['type'] = type_text.strip() if type_text else ''
     except:
         pass
 
     try:
         # Find the rating
-        rating_img = table.find('img', class_='guide-header__type-icon guide-header__type-icon--stars')
-        if rating_img:
-            rating_span = rating_img.find_next_sibling('span')
-            df.at[index, 'rating'] = rating_span.text if rating_span else ''
+        rating_span = table.select_one(RATING_SELECTOR)
+        info['rating'] = rating_span.text if rating_span else ''
     except:
         pass
 
     try:
         # Find the reliability
-        tds = table.find_all('td')
+        tds = table.select('td')
         if len(tds) > 2:
-            df.at[index, 'reliability'] = tds[2].text.strip()
+            info['reliability'] = tds[2].text.strip()
     except:
         pass
+    
+    return info
 
 
-def extract_additional_info(soup, df, index):
+def extract_additional_info(soup):
     """Extract directions, seasonal info, and summary"""
+    info = {
+        'swell_direction': '', 'wind_direction': '', 'best_month': '',
+        'best_season': '', 'summary': '', 'time_of_year': ''
+    }
+    
     try:
         # Find the swell direction and wind direction
-        p_tag = soup.find('div', class_='guide-header__best-surf').find('p')
+        p_tag = soup.select_one(BEST_SURF_SELECTOR)
         if p_tag:
-            swell_spans = p_tag.find_all('span', class_='guide-header__dir')
+            swell_spans = p_tag.select(DIRECTION_SELECTOR)
             if len(swell_spans) > 0:
-                df.at[index, 'swell_direction'] = swell_spans[0].text
+                info['swell_direction'] = swell_spans[0].text
             if len(swell_spans) > 1:
-                df.at[index, 'wind_direction'] = swell_spans[1].text
+                info['wind_direction'] = swell_spans[1].text
     except:
         pass
 
     try:
         # Find the best month and best season
-        best_month_div = soup.find('div', class_='guide-page__best-month')
+        best_month_div = soup.select_one(BEST_MONTH_SELECTOR)
         if best_month_div:
-            df.at[index, 'best_month'] = best_month_div.text.split('Best')[0]
-            season_span = best_month_div.find('span')
+            info['best_month'] = best_month_div.text.split('Best')[0]
+            season_span = best_month_div.select_one('span')
             if season_span and ':' in season_span.text:
-                df.at[index, 'best_season'] = season_span.text.split(': ')[1]
+                info['best_season'] = season_span.text.split(': ')[1]
     except:
         pass
 
     try:
         # Find the summary
-        summary_div = soup.find('div', class_='guide-header__summary__text')
+        summary_div = soup.select_one(SUMMARY_SELECTOR)
         if summary_div:
-            df.at[index, 'summary'] = summary_div.text.strip()
+            info['summary'] = summary_div.text.strip()
     except:
         pass
 
     try:
         # Find the time of year
-        time_of_year_div = soup.find('div', class_='guide-page__text')
+        time_of_year_div = soup.select_one(TIME_OF_YEAR_SELECTOR)
         if time_of_year_div:
-            df.at[index, 'time_of_year'] = time_of_year_div.text.strip()
+            info['time_of_year'] = time_of_year_div.text.strip()
     except:
         pass
+    
+    return info
 
 
 def save_data(df, output_dir="../data", filename="surf_breaks_complete.csv"):
@@ -181,7 +322,7 @@ def save_data(df, output_dir="../data", filename="surf_breaks_complete.csv"):
     
     # Save DataFrame to CSV
     output_path = os.path.join(output_dir, filename)
-    df.to_csv(output_path, index=False)
+    pacsv.write_csv(pa.Table.from_pandas(df, preserve_index=False), output_path)
     print(f"Complete data saved to {output_path}")
 
 
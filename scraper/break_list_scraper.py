@@ -7,50 +7,43 @@ collecting basic information such as break names, links, and countries.
 """
 
 import os
+from concurrent.futures import ThreadPoolExecutor
 import requests
 from bs4 import BeautifulSoup
 import pandas as pd
+import pyarrow as pa
+import pyarrow.csv as pacsv
 from tqdm import tqdm
 
+# Import the shared session whether run as a script or as part of the package
+try:
+    from scraper.session import SESSION
+except ImportError:
+    from session import SESSION
 
-def scrape_surf_breaks(pages=27):
+
+BASE_URL = "PLACEHOLDER_URL/breaks?page="  # URL placeholder to be replaced with actual site
+
+
+def scrape_surf_breaks(pages=27, max_workers=16):
     """
     Scrape the list of surf breaks from the surf forecast website.
     
     Args:
         pages (int): Number of pages to scrape
+        max_workers (int): Number of pages to fetch concurrently
         
     Returns:
         pd.DataFrame: DataFrame containing break names, links, and countries
     """
     print("Scraping surf break list...")
-    base_url = "PLACEHOLDER_URL/breaks?page="  # URL placeholder to be replaced with actual site
     data = []
 
-    for i in tqdm(range(1, pages + 1), desc="Scraping pages"):
-        url = base_url + str(i)
-        try:
-            response = requests.get(url)
-            response.raise_for_status()  # Raise an exception for HTTP errors
-            
-            soup = BeautifulSoup(response.text, 'html.parser')
-            rows = soup.find_all('td')
-
-            for col in rows:
-                a_tag = col.find('a')
-                span_tag = col.find('span', class_='rem')
-                if a_tag and span_tag:
-                    name = a_tag.text
-                    link = a_tag['href']
-                    country = span_tag.text
-                    data.append({
-                        'name': name,
-                        'link': link,
-                        'country': country
-                    })
-        except requests.exceptions.RequestException as e:
-            print(f"Error scraping page {i}: {e}")
-            continue
+    # Fetch the pages concurrently, keeping the results in page order
+    with ThreadPoolExecutor(max_workers=max_workers) as executor:
+        page_results = executor.map(scrape_page, range(1, pages + 1))
+        for page_data in tqdm(page_results, total=pages, desc="Scraping pages"):
+            data.extend(page_data)
 
     # Create DataFrame from collected data
     df = pd.DataFrame(data)
@@ -59,6 +52,44 @@ def scrape_surf_breaks(pages=27):
     return df
 
 
+def scrape_page(page):
+    """
+    Scrape the surf breaks listed on a single page.
+    
+    Args:
+        page (int): Page number to scrape
+        
+    Returns:
+        list: Dictionaries with break names, links, and countries
+    """
+    url = BASE_URL + str(page)
+    data = []
+    
+    try:
+        response = SESSION.get(url, timeout=10)
+        response.raise_for_status()  # Raise an exception for HTTP errors
+        
+        soup = BeautifulSoup(response.content, 'lxml')
+        rows = soup.find_all('td')
+
+        for col in rows:
+            a_tag = col.find('a')
+            span_tag = col.find('span', class_='rem')
+            if a_tag and span_tag:
+                name = a_tag.text
+                link = a_tag['href']
+                country = span_tag.text
+                data.append({
+                    'name': name,
+                    'link': link,
+                    'country': country
+                })
+    except requests.exceptions.RequestException as e:
+        print(f"Error scraping page {page}: {e}")
+    
+    return data
+
+
 def save_data(df, output_dir="../data", filename="surf_breaks_list.csv"):
     """
     Save the scraped data to a CSV file.
@@ -73,7 +104,7 @@ def save_data(df, output_dir="../data", filename="surf_breaks_list.csv"):
     
     # Save DataFrame to CSV
     output_path = os.path.join(output_dir, filename)
-    df.to_csv(output_path, index=False)
+    pacsv.write_csv(pa.Table.from_pandas(df, preserve_index=False), output_path)
     print(f"Data saved to {output_path}")
 
 
@@ -0,0 +1,22 @@
+#!/usr/bin/env python3
+"""
+Session Module
+
+This module provides the HTTP session shared by the scrapers, so retry and
+connection pool settings live in one place.
+"""
+
+import requests
+from requests.adapters import HTTPAdapter
+from urllib3.util.retry import Retry
+
+
+# Shared session so connections to the site are pooled and kept alive across requests
+SESSION = requests.Session()
+_adapter = HTTPAdapter(
+    pool_connections=16,
+    pool_maxsize=16,
+    max_retries=Retry(total=3, backoff_factor=0.3)
+)
+SESSION.mount('https://', _adapter)
+SESSION.mount('http://', _adapter)
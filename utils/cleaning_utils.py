@@ -4,22 +4,82 @@ Cleaning Utilities Module
 
 This module provides utility functions for cleaning and processing data
 used across multiple scripts in the project.
+
+numpy, pandas and pyarrow are imported inside the functions that need them,
+so scripts that only use create_directories or clean_text don't load them.
 """
 
 import os
 import string
-import pandas as pd
+import threading
+from concurrent.futures import ThreadPoolExecutor
+
+
+# Absolute paths of directories this process has already created or found
+_CREATED = set()
+_CREATED_LOCK = threading.Lock()
+
+# Translation tables that strip punctuation, and punctuation plus spaces, from text
+_PUNCT_TRANS = str.maketrans('', '', string.punctuation)
+_PUNCT_SPACE_TRANS = str.maketrans('', '', string.punctuation + ' ')
+
+# From this many strings on, text is cleaned in parallel chunks
+_PARALLEL_CLEAN_MIN_VALUES = 10_000
+
+# Above this many compared values, hashing beats numpy's sort-based set routines
+_HASH_SET_OPS_MIN_VALUES = 1_000_000
+
+# clean_text variants keyed by (remove_spaces, lowercase)
+_CLEAN_VARIANTS = {
+    (False, False): lambda text: text.translate(_PUNCT_TRANS),
+    (False, True): lambda text: text.translate(_PUNCT_TRANS).lower(),
+    (True, False): lambda text: text.translate(_PUNCT_SPACE_TRANS),
+    (True, True): lambda text: text.translate(_PUNCT_SPACE_TRANS).lower(),
+}
+
+# Translation table that turns spaces and hyphens in column names into underscores
+_COLNAME_TRANS = str.maketrans({' ': '_', '-': '_'})
+
+# ASCII punctuation bytes, for cleaning raw UTF-8 buffers
+_PUNCT_BYTES = string.punctuation.encode()
+
+# Per-byte constants for lowercasing ASCII eight bytes at a time: adding 0x3f
+# sets a byte's high bit from 'A' up, adding 0x25 sets it from past 'Z'
+_SWAR_FROM_A = 0x3f3f3f3f3f3f3f3f
+_SWAR_PAST_Z = 0x2525252525252525
+_SWAR_HIGH_BITS = 0x8080808080808080
 
 
 def create_directories(dirs):
     """
     Create multiple directories if they don't exist.
     
+    Directories created in an earlier call are remembered and not checked again,
+    so a directory removed while the process runs is not recreated.
+    
     Args:
         dirs (list): List of directory paths to create
     """
-    for directory in dirs:
-        os.makedirs(directory, exist_ok=True)
+    with _CREATED_LOCK:
+        # Sort by path components so each directory comes just before its subdirectories
+        paths = sorted({os.path.abspath(d) for d in dirs} - _CREATED, key=lambda p: p.split(os.sep))
+        
+        last_created = None
+        for directory in reversed(paths):
+            # Creating a subdirectory already created its parents
+            if last_created is None or not last_created.startswith(directory + os.sep):
+                try:
+                    os.mkdir(directory)
+                except FileNotFoundError:
+                    # Parent directories are missing too
+                    os.makedirs(directory, exist_ok=True)
+                except FileExistsError:
+                    if not os.path.isdir(directory):
+                        raise
+                
+                last_created = directory
+            
+            _CREATED.add(directory)
 
 
 def clean_text(text, remove_spaces=False, lowercase=True):
@@ -35,23 +95,207 @@ def clean_text(text, remove_spaces=False, lowercase=True):
         str: Cleaned text
     """
     # Convert to string in case of non-string input
-    text = str(text)
+    if type(text) is not str:
+        text = str(text)
     
-    # Create a translation table to remove punctuation
-    trans = str.maketrans('', '', string.punctuation)
+    return _CLEAN_VARIANTS[bool(remove_spaces), bool(lowercase)](text)
+
+
+def clean_text_series(texts, remove_spaces=False, lowercase=True):
+    """
+    Clean a Series of text by removing punctuation and optionally spaces and case.
     
-    # Remove punctuation
-    text = text.translate(trans)
+    Vectorized equivalent of applying clean_text to every element.
     
-    # Remove spaces if requested
-    if remove_spaces:
-        text = text.replace(' ', '')
+    Args:
+        texts (pd.Series): Text to clean
+        remove_spaces (bool): Whether to remove spaces
+        lowercase (bool): Whether to convert to lowercase
+        
+    Returns:
+        pd.Series: Cleaned text
+    """
+    import pandas as pd
+    import pyarrow as pa
+    
+    # Convert to strings the way str(text) does; astype(str) keeps missing values
+    # missing, so those are stringified one by one (None -> 'None', NaN -> 'nan')
+    missing = texts.isna()
+    strings = texts.astype(str)
+    if missing.any():
+        strings = strings.astype(object)
+        strings[missing] = [str(value) for value in texts[missing]]
+    texts = strings
+    
+    # Clean the raw UTF-8 bytes when possible, splitting large inputs across threads
+    arrow_texts = pa.array(texts, type=pa.large_string())
+    workers = os.cpu_count() or 1
+    if len(arrow_texts) < _PARALLEL_CLEAN_MIN_VALUES or workers == 1:
+        chunks = [arrow_texts]
+    else:
+        chunk_size = -(-len(arrow_texts) // workers)
+        chunks = [arrow_texts.slice(start, chunk_size) for start in range(0, len(arrow_texts), chunk_size)]
+    
+    if len(chunks) == 1:
+        cleaned = [clean_text_arrow(arrow_texts, remove_spaces, lowercase)]
+    else:
+        with ThreadPoolExecutor(max_workers=len(chunks)) as executor:
+            cleaned = list(executor.map(lambda chunk: clean_text_arrow(chunk, remove_spaces, lowercase), chunks))
+    
+    if all(chunk is not None for chunk in cleaned):
+        cleaned = pa.concat_arrays(cleaned)
+        return pd.Series(cleaned.to_numpy(zero_copy_only=False), index=texts.index, name=texts.name)
+    
+    # Remove punctuation, and spaces if requested
+    texts = texts.str.translate(_PUNCT_SPACE_TRANS if remove_spaces else _PUNCT_TRANS)
     
     # Convert to lowercase if requested
     if lowercase:
-        text = text.lower()
+        texts = texts.str.lower()
     
-    return text
+    return texts
+
+
+def clean_text_arrow(texts, remove_spaces=False, lowercase=True):
+    """
+    Clean an Arrow string array by working directly on its UTF-8 byte buffer.
+    
+    Punctuation and spaces are single ASCII bytes that never occur inside a
+    multi-byte UTF-8 character, so they can be dropped byte by byte. Lowercasing
+    bytes only works for ASCII text.
+    
+    Args:
+        texts (pa.LargeStringArray): Text to clean
+        remove_spaces (bool): Whether to remove spaces
+        lowercase (bool): Whether to convert to lowercase
+        
+    Returns:
+        pa.LargeStringArray: Cleaned text, or None if lowercasing was requested
+        for non-ASCII text
+    """
+    import numpy as np
+    import pyarrow as pa
+    import pyarrow.compute as pc
+    
+    _, offsets, data = texts.buffers()
+    
+    # Restrict the buffers to this array's strings, which matters for slices
+    offsets = np.frombuffer(offsets, dtype=np.int64)[texts.offset:texts.offset + len(texts) + 1]
+    data = np.frombuffer(data, dtype=np.uint8) if data is not None else np.empty(0, dtype=np.uint8)
+    data = data[offsets[0]:offsets[-1]]
+    offsets = offsets - offsets[0]
+    
+    if lowercase and (data >= 0x80).any():
+        return None
+    
+    # Mark the bytes to keep using a lookup table over all byte values
+    is_punct = np.zeros(256, dtype=bool)
+    is_punct[np.frombuffer(_PUNCT_BYTES, dtype=np.uint8)] = True
+    keep = ~is_punct[data]
+    if remove_spaces:
+        keep &= data != ord(' ')
+    
+    # Convert to lowercase
+    if lowercase:
+        data = lowercase_ascii_bytes(data)
+    
+    # Each string's new offset is the number of kept bytes before it
+    kept_before = np.concatenate(([0], np.cumsum(keep, dtype=np.int64)))
+    
+    # Rebuild the validity bitmap from the first string, since slices may start mid-byte
+    validity = pc.is_valid(texts).buffers()[1] if texts.null_count else None
+    
+    return pa.Array.from_buffers(
+        pa.large_string(),
+        len(texts),
+        [validity, pa.py_buffer(kept_before[offsets]), pa.py_buffer(data[keep])],
+        null_count=texts.null_count
+    )
+
+
+def lowercase_ascii_bytes(data):
+    """
+    Lowercase a buffer of ASCII bytes, working on eight bytes at a time.
+    
+    Args:
+        data (np.ndarray): ASCII bytes (uint8, all below 0x80)
+        
+    Returns:
+        np.ndarray: Lowercased bytes
+    """
+    import numpy as np
+    
+    # Pad to whole 64-bit words; zero bytes are left unchanged
+    padded = np.zeros(-(-len(data) // 8) * 8, dtype=np.uint8)
+    padded[:len(data)] = data
+    words = padded.view(np.uint64)
+    
+    # High bit of each byte in A-Z, shifted down to the 0x20 case bit
+    upper = (
+        (words + np.uint64(_SWAR_FROM_A))
+        & ~(words + np.uint64(_SWAR_PAST_Z))
+        & np.uint64(_SWAR_HIGH_BITS)
+    )
+    
+    return (words | (upper >> np.uint64(2))).view(np.uint8)[:len(data)]
+
+
+def to_arrow_string(values):
+    """
+    Convert a Series to pyarrow-backed strings unless it already is.
+    
+    Args:
+        values (pd.Series): Series to convert
+        
+    Returns:
+        pd.Series: Series with 'string[pyarrow]' dtype
+    """
+    if values.dtype == 'string[pyarrow]':
+        return values
+    return values.astype('string[pyarrow]')
+
+
+def get_unique_values(values):
+    """
+    Get the distinct values of a Series.
+    
+    String columns are converted to pyarrow-backed strings so Arrow finds the
+    distinct values; other object columns are read from their categories.
+    
+    Args:
+        values (pd.Series): Series to get distinct values from
+        
+    Returns:
+        np.ndarray: Distinct values, including the missing values (None or NaN) if any
+    """
+    import numpy as np
+    import pandas as pd
+    
+    if values.dtype == object:
+        # Keep the column's own missing values, with None and NaN distinct as unique() returns them
+        missing = values[values.isna()].unique()
+        
+        if pd.api.types.infer_dtype(values, skipna=True) == 'string':
+            uniques = to_arrow_string(values).dropna().unique().to_numpy(dtype=object)
+        else:
+            uniques = values.astype('category').cat.remove_unused_categories().cat.categories.to_numpy()
+        
+        return np.concatenate([uniques, missing]) if len(missing) else uniques
+    
+    if isinstance(values.dtype, pd.StringDtype):
+        # Return missing values as NaN, as unique() does for object columns
+        return values.unique().to_numpy(dtype=object, na_value=np.nan)
+    
+    if not isinstance(values.dtype, pd.CategoricalDtype):
+        return values.unique()
+    
+    uniques = values.cat.remove_unused_categories().cat.categories.to_numpy()
+    
+    # Categories never include missing values, so add them back if present
+    if values.hasnans:
+        uniques = np.append(uniques, np.nan)
+    
+    return uniques
 
 
 def compare_column_values(df1, df2, column, clean=True):
@@ -67,20 +311,32 @@ def compare_column_values(df1, df2, column, clean=True):
     Returns:
         tuple: (common_values, unique_values) as lists
     """
+    import numpy as np
+    import pandas as pd
+    
     # Get unique values from each DataFrame
-    values1 = df1[column].unique()
-    values2 = df2[column].unique()
+    values1 = get_unique_values(df1[column])
+    values2 = get_unique_values(df2[column])
     
-    # Clean values if requested
+    # Clean values if requested, dropping values that clean to the same text
     if clean:
-        values1 = [clean_text(v) for v in values1]
-        values2 = [clean_text(v) for v in values2]
+        values1 = clean_text_series(pd.Series(values1, dtype=object)).drop_duplicates().to_numpy()
+        values2 = clean_text_series(pd.Series(values2, dtype=object)).drop_duplicates().to_numpy()
     
-    # Find common and unique values
-    common_values = list(set(values1) & set(values2))
-    unique_values = list(set(values1) ^ set(values2))
+    # Find common and unique values, hashing through pandas Index for large inputs
+    if len(values1) + len(values2) >= _HASH_SET_OPS_MIN_VALUES:
+        index1, index2 = pd.Index(values1), pd.Index(values2)
+        return index1.intersection(index2).tolist(), index1.symmetric_difference(index2).tolist()
     
-    return common_values, unique_values
+    try:
+        # Each side holds distinct values, so the set routines can skip deduplicating
+        common_values = np.intersect1d(values1, values2, assume_unique=True)
+        unique_values = np.setxor1d(values1, values2, assume_unique=True)
+    except TypeError:
+        # Uncleaned values of mixed types (e.g. strings and NaN) can't be sorted
+        return list(set(values1) & set(values2)), list(set(values1) ^ set(values2))
+    
+    return common_values.tolist(), unique_values.tolist()
 
 
 def find_duplicates(df, columns=None, return_counts=False):
@@ -95,18 +351,24 @@ def find_duplicates(df, columns=None, return_counts=False):
     Returns:
         pd.DataFrame: Duplicate entries
     """
+    import numpy as np
+    import pandas as pd
+    
     if columns is None:
-        duplicates = df[df.duplicated(keep=False)]
-    else:
-        duplicates = df[df.duplicated(subset=columns, keep=False)]
+        columns = df.columns.tolist()
+    elif isinstance(columns, str):
+        columns = [columns]
+    
+    # Number each distinct key once, then count how many rows share each key
+    codes, keys = pd.MultiIndex.from_frame(df[columns]).factorize()
+    key_counts = np.bincount(codes, minlength=len(keys))
+    
+    # Rows whose key occurs more than once are the duplicates
+    duplicates = df[key_counts[codes] > 1]
     
     if return_counts:
-        if columns is None:
-            counts = df.groupby(list(df.columns)).size().reset_index(name='count')
-            counts = counts[counts['count'] > 1]
-        else:
-            counts = df.groupby(columns).size().reset_index(name='count')
-            counts = counts[counts['count'] > 1]
+        counts = keys[key_counts > 1].to_frame(index=False, name=list(columns))
+        counts['count'] = key_counts[key_counts > 1]
         return duplicates, counts
     
     return duplicates
@@ -116,19 +378,21 @@ def standardize_column_names(df):
     """
     Standardize column names in a DataFrame.
     
+    The returned DataFrame shares its data with the input; callers that need
+    an independent copy should call .copy() on the result.
+    
     Args:
         df (pd.DataFrame): DataFrame with columns to standardize
         
     Returns:
         pd.DataFrame: DataFrame with standardized column names
     """
-    # Create a copy of the DataFrame
-    df_clean = df.copy()
+    # Create a shallow copy so only the column labels are rebuilt
+    df_clean = df.copy(deep=False)
     
-    # Clean column names: lowercase, replace spaces with underscores
-    df_clean.columns = [
-        col.lower().replace(' ', '_').replace('-', '_') for col in df_clean.columns
-    ]
+    # Clean column names: lowercase, replace spaces and hyphens with underscores
+    # (as str methods, so non-string labels raise instead of becoming NaN)
+    df_clean.columns = df_clean.columns.map(lambda col: col.translate(_COLNAME_TRANS).lower())
     
     return df_clean
 
@@ -144,10 +408,16 @@ def remove_empty_columns(df, threshold=0.9):
     Returns:
         pd.DataFrame: DataFrame with empty columns removed
     """
-    # Calculate percentage of empty values for each column
-    empty_pct = df.isna().mean()
+    import numpy as np
+    
+    # Count empty values for each column from its non-null count
+    empty_counts = len(df) - df.count().to_numpy()
+    
+    # Calculate percentage of empty values (NaN for an empty DataFrame, which drops every column)
+    with np.errstate(divide='ignore', invalid='ignore'):
+        empty_pct = empty_counts / len(df)
     
-    # Get columns to keep
-    cols_to_keep = empty_pct[empty_pct < threshold].index.tolist()
+    # Get positions of columns to keep
+    cols_to_keep = np.flatnonzero(empty_pct < threshold)
     
-    return df[cols_to_keep]
\ No newline at end of file
+    return df.iloc[:, cols_to_keep]
\ No newline at end of file